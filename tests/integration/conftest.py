@@ -1,6 +1,8 @@
 # Copyright 2022 Canonical Ltd.
 # See LICENSE file for licensing details.
+import asyncio
 import functools
+import hashlib
 import logging
 import os
 import shutil
@@ -8,7 +10,7 @@ import socket
 import subprocess
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict
 
@@ -18,9 +20,28 @@ import yaml
 from juju.errors import JujuError
 from pytest_operator.plugin import OpsTest
 
+from tests.integration.helpers import SETTLED_APPS, charm_resources, load_metadata
+
 trfk_root = Path(__file__).parent.parent.parent
-trfk_meta = yaml.safe_load((trfk_root / "metadata.yaml").read_text())
-trfk_resources = {name: val["upstream-source"] for name, val in trfk_meta["resources"].items()}
+trfk_resources = charm_resources(trfk_root)
+
+# Packed charms, keyed by a digest of their sources, so that unchanged charms aren't rebuilt.
+_CHARM_CACHE_DIR = trfk_root / ".charm-cache"
+# The digest doesn't cover unpinned dependencies (e.g. `charm-binary-python-packages`), so cached
+# charms are only reused for so long before they are rebuilt against whatever is current.
+_CHARM_CACHE_MAX_AGE = timedelta(days=float(os.environ.get("CHARM_CACHE_MAX_AGE_DAYS", 7)))
+_CHARM_SOURCES = (
+    "src",
+    "lib",
+    "metadata.yaml",
+    "charmcraft.yaml",
+    "config.yaml",
+    "actions.yaml",
+    "requirements.txt",
+)
+# Shared by all the `charmcraft pack` runs, so pip downloads and wheel builds are reused across
+# the charms (and across test runs) instead of being redone in each fresh build instance.
+_CRAFT_SHARED_CACHE = Path.home() / ".cache" / "charmcraft"
 
 _JUJU_DATA_CACHE = {}
 _JUJU_KEYS = ("egress-subnets", "ingress-address", "private-address")
@@ -80,105 +101,107 @@ def copy_traefik_library_into_tester_charms(ops_test):
             shutil.copyfile(f"lib/charms/{lib}", install_path)
 
 
-@pytest.fixture(scope="module")
-@timed_memoizer
-async def traefik_charm(ops_test):
+def _charm_digest(charm_path: Path) -> str:
+    """Hash the charm sources that end up in the packed charm."""
+    digest = hashlib.sha256()
+    for source in _CHARM_SOURCES:
+        root = charm_path / source
+        files = sorted(root.rglob("*")) if root.is_dir() else [root]
+        for path in files:
+            if not path.is_file() or "__pycache__" in path.parts:
+                continue
+            digest.update(str(path.relative_to(charm_path)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+async def build_charm_cached(ops_test: OpsTest, charm_path: Path, name: str) -> Path:
+    """Build a charm, reusing a previously packed artifact if its sources did not change."""
+    cached = _CHARM_CACHE_DIR / f"{name}-{_charm_digest(charm_path)}.charm"
+    # Evict this charm's stale builds, including the ones of sources that changed since.
+    oldest = (datetime.now() - _CHARM_CACHE_MAX_AGE).timestamp()
+    for stale in _CHARM_CACHE_DIR.glob(f"{name}-*.charm"):
+        if stale.stat().st_mtime < oldest:
+            logger.info("Evicting stale %s charm: %s", name, stale)
+            stale.unlink()
+
+    if cached.exists():
+        logger.info("Using cached %s charm: %s", name, cached)
+        return cached
+
     count = 0
     while True:
         try:
-            charm = await ops_test.build_charm(".", verbosity="debug")
-            return charm
+            charm = await _pack_charm(ops_test, charm_path)
+            break
         except RuntimeError:
-            logger.warning("Failed to build traefik. Trying again!")
+            logger.warning("Failed to build %s. Trying again!", name)
             count += 1
 
             if count == 3:
                 raise
 
+    _CHARM_CACHE_DIR.mkdir(exist_ok=True)
+    shutil.move(str(charm), cached)
+    return cached
+
+
+async def _pack_charm(ops_test: OpsTest, charm_path: Path) -> Path:
+    """Like `ops_test.build_charm`, but with the shared craft cache set for the pack call only."""
+    _CRAFT_SHARED_CACHE.mkdir(parents=True, exist_ok=True)
+    cmd = ["env", f"CRAFT_SHARED_CACHE={_CRAFT_SHARED_CACHE}"]
+    cmd += ["charmcraft", "pack", "--verbosity=debug"]
+    if ops_test.destructive_mode:
+        cmd.append("--destructive-mode")
+
+    returncode, stdout, stderr = await ops_test.run(*cmd, cwd=charm_path)
+    if returncode != 0:
+        raise RuntimeError(f"Failed to build charm {charm_path}:\n{stderr}\n{stdout}")
+
+    # charmcraft names the charm after the app, plus the base(s) it was packed for.
+    charm_name = load_metadata(charm_path)["name"]
+    return sorted(charm_path.glob(f"{charm_name}_*.charm"))[0]
+
+
+@pytest.fixture(scope="module")
+@timed_memoizer
+async def traefik_charm(ops_test):
+    return await build_charm_cached(ops_test, trfk_root, "traefik")
+
 
 @pytest.fixture(scope="module")
 @timed_memoizer
 async def forward_auth_tester_charm(ops_test):
     charm_path = (Path(__file__).parent / "testers" / "forward-auth").absolute()
-    count = 0
-    while True:
-        try:
-            charm = await ops_test.build_charm(charm_path, verbosity="debug")
-            return charm
-        except RuntimeError:
-            logger.warning("Failed to build forward auth tester. Trying again!")
-            count += 1
-
-            if count == 3:
-                raise
+    return await build_charm_cached(ops_test, charm_path, "forward auth tester")
 
 
 @pytest.fixture(scope="module")
 @timed_memoizer
 async def ipa_tester_charm(ops_test):
     charm_path = (Path(__file__).parent / "testers" / "ipa").absolute()
-    count = 0
-    while True:
-        try:
-            charm = await ops_test.build_charm(charm_path, verbosity="debug")
-            return charm
-        except RuntimeError:
-            logger.warning("Failed to build ipa tester. Trying again!")
-            count += 1
-
-            if count == 3:
-                raise
+    return await build_charm_cached(ops_test, charm_path, "ipa tester")
 
 
 @pytest.fixture(scope="module")
 @timed_memoizer
 async def ipu_tester_charm(ops_test):
     charm_path = (Path(__file__).parent / "testers" / "ipu").absolute()
-    count = 0
-    while True:
-        try:
-            charm = await ops_test.build_charm(charm_path, verbosity="debug")
-            return charm
-        except RuntimeError:
-            logger.warning("Failed to build ipu tester. Trying again!")
-            count += 1
-
-            if count == 3:
-                raise
+    return await build_charm_cached(ops_test, charm_path, "ipu tester")
 
 
 @pytest.fixture(scope="module")
 @timed_memoizer
 async def tcp_tester_charm(ops_test):
     charm_path = (Path(__file__).parent / "testers" / "tcp").absolute()
-    count = 0
-    while True:
-        try:
-            charm = await ops_test.build_charm(charm_path, verbosity="debug")
-            return charm
-        except RuntimeError:
-            logger.warning("Failed to build tcp tester. Trying again!")
-            count += 1
-
-            if count == 3:
-                raise
+    return await build_charm_cached(ops_test, charm_path, "tcp tester")
 
 
 @pytest.fixture(scope="module")
 @timed_memoizer
 async def route_tester_charm(ops_test):
     charm_path = (Path(__file__).parent / "testers" / "route").absolute()
-    count = 0
-    while True:
-        try:
-            charm = await ops_test.build_charm(charm_path, verbosity="debug")
-            return charm
-        except RuntimeError:
-            logger.warning("Failed to build route tester. Trying again!")
-            count += 1
-
-            if count == 3:
-                raise
+    return await build_charm_cached(ops_test, charm_path, "route tester")
 
 
 @pytest.fixture(scope="module")
@@ -354,7 +377,20 @@ def assert_can_connect(ip, port):
     assert _can_connect(ip, port), f"{ip}:{port} is down/unreachable"
 
 
+def _is_settled(ops_test: OpsTest, app_name: str) -> bool:
+    """Whether the app was already deployed and waited for in this session, and is still there.
+
+    The latter is checked against the local model state, so this doesn't cost a juju API call.
+    """
+    return (ops_test.model.uuid, app_name) in SETTLED_APPS and bool(
+        ops_test.model.applications.get(app_name)
+    )
+
+
 async def deploy_traefik_if_not_deployed(ops_test: OpsTest, traefik_charm):
+    if _is_settled(ops_test, "traefik-k8s"):
+        return
+
     try:
         await ops_test.model.deploy(
             traefik_charm, application_name="traefik-k8s", resources=trfk_resources
@@ -365,9 +401,13 @@ async def deploy_traefik_if_not_deployed(ops_test: OpsTest, traefik_charm):
 
     # now we're most definitely active.
     await ops_test.model.wait_for_idle(["traefik-k8s"], timeout=1000)
+    SETTLED_APPS.add((ops_test.model.uuid, "traefik-k8s"))
 
 
 async def deploy_charm_if_not_deployed(ops_test: OpsTest, charm, app_name: str, resources=None):
+    if _is_settled(ops_test, app_name):
+        return
+
     if not ops_test.model.applications.get(app_name):
         await ops_test.model.deploy(charm, resources=resources, application_name=app_name)
 
@@ -375,6 +415,7 @@ async def deploy_charm_if_not_deployed(ops_test: OpsTest, charm, app_name: str,
     # if we're running this locally, we need to wait for "waiting"
     # CI however deploys all in a single model, so traefik is active already.
     await ops_test.model.wait_for_idle([app_name], status="active", timeout=1000)
+    SETTLED_APPS.add((ops_test.model.uuid, app_name))
 
 
 async def safe_relate(ops_test: OpsTest, ep1, ep2):
@@ -389,6 +430,51 @@ async def safe_relate(ops_test: OpsTest, ep1, ep2):
         pass
 
 
+@pytest.fixture(scope="module")
+async def root_ca(ops_test: OpsTest) -> str:
+    """A self-signed certificates provider.
+
+    Deployed only if missing, so that modules running in the same model share a single CA.
+    """
+    if not ops_test.model.applications.get("root-ca"):
+        await ops_test.model.deploy(
+            "ch:self-signed-certificates",
+            application_name="root-ca",
+            channel="edge",
+            config={"ca-common-name": "demo.ca.local"},
+        )
+    return "root-ca"
+
+
+@pytest.fixture(scope="module")
+async def oathkeeper_attached(ops_test: OpsTest, traefik_charm):
+    """Traefik with experimental forward-auth enabled, integrated with oathkeeper.
+
+    Module-scoped, like `ops_test` itself: each test module gets its own model, and with it its
+    own oathkeeper deployment. Deploys are skipped for apps already in the model, so requesting
+    the fixture after traefik was deployed by the module doesn't redeploy it.
+    """
+
+    async def deploy_oathkeeper():
+        if not ops_test.model.applications.get("oathkeeper"):
+            await ops_test.model.deploy(
+                "oathkeeper",
+                channel="latest/edge",
+                config={"dev": "True"},
+                trust=True,
+            )
+
+    await asyncio.gather(
+        deploy_traefik_if_not_deployed(ops_test, traefik_charm), deploy_oathkeeper()
+    )
+    await ops_test.model.applications["traefik-k8s"].set_config(
+        {"enable_experimental_forward_auth": "True"}
+    )
+
+    await safe_relate(ops_test, "traefik-k8s:experimental-forward-auth", "oathkeeper")
+    return "oathkeeper"
+
+
 @pytest.fixture(autouse=True, scope="module")
 async def setup_env(ops_test: OpsTest):
     # Prevent "update-status" from interfering with the test:
@@ -2,20 +2,58 @@
 # See LICENSE file for licensing details.
 
 import asyncio
+import functools
 import json
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Optional
 
 import requests
 import sh
+import urllib3
+import yaml
 from juju.application import Application
 from juju.unit import Unit
 from minio import Minio
 from pytest_operator.plugin import OpsTest
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+try:  # use the libyaml bindings when available
+    from yaml import CSafeDumper as SafeDumper  # noqa: F401
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
+TRAEFIK_ROOT = Path(__file__).parent.parent.parent
+
+# Shared by the tests so that repeated requests to the same host reuse pooled connections,
+# instead of paying for a new TCP (and TLS) handshake every time.
+http_session = requests.Session()
+http_session.verify = False
+http_session.mount("http://", HTTPAdapter(pool_maxsize=8))
+http_session.mount("https://", HTTPAdapter(pool_maxsize=8))
+# All the tests talk to self-signed endpoints; don't warn about it on every request.
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# (model uuid, app name) pairs deployed and waited for by the `deploy_*_if_not_deployed` helpers.
+# Whatever removes an application must drop it from here (see `forget_settled`).
+SETTLED_APPS = set()
+
+
+@functools.lru_cache(maxsize=None)
+def load_metadata(charm_root: Path = TRAEFIK_ROOT) -> dict:
+    """Parse a charm's metadata.yaml, once per session."""
+    return yaml.load((charm_root / "metadata.yaml").read_text(), Loader=SafeLoader)
+
+
+def charm_resources(charm_root: Path = TRAEFIK_ROOT) -> Dict[str, str]:
+    """Map each oci-image resource of a charm to its upstream source, for deploying."""
+    meta = load_metadata(charm_root)
+    return {name: val["upstream-source"] for name, val in meta["resources"].items()}
+
 
 async def get_k8s_service_address(ops_test: OpsTest, service_name: str) -> Optional[str]:
     """Get the address of a LoadBalancer Kubernetes service using kubectl.
@@ -75,12 +113,18 @@ async def get_address(ops_test: OpsTest, app_name: str, unit_num: Optional[int]
     )
 
 
+def forget_settled(ops_test: OpsTest, name: str):
+    """Make the next `deploy_*_if_not_deployed` call deploy and wait for the app again."""
+    SETTLED_APPS.discard((ops_test.model.uuid, name))
+
+
 async def remove_application(
     ops_test: OpsTest, name: str, *, timeout: int = 60, force: bool = True
 ):
     # In CI, tests consistently timeout on `waiting: gateway address unavailable`.
     # Just in case there's an unreleased socket, let's try to remove traefik more gently.
 
+    forget_settled(ops_test, name)
     app = ops_test.model.applications.get(name)
     if not app:
         return
@@ -173,10 +217,7 @@ async def deploy_tempo_cluster(ops_test: OpsTest):
 def get_traces(tempo_host: str, service_name="tracegen-otlp_http", tls=True):
     """Get traces directly from Tempo REST API."""
     url = f"{'https' if tls else 'http'}://{tempo_host}:3200/api/search?tags=service.name={service_name}"
-    req = requests.get(
-        url,
-        verify=False,
-    )
+    req = http_session.get(url, timeout=(5, 10))
     assert req.status_code == 200
     traces = json.loads(req.text)["traces"]
     return traces
@@ -189,7 +230,10 @@ async def get_traces_patiently(tempo_host, service_name="tracegen-otlp_http", tl
     Useful for cases when Tempo might not return the traces immediately (its API is known for returning data in
     random order).
     """
-    traces = get_traces(tempo_host, service_name=service_name, tls=tls)
+    # Not asyncio.to_thread: that's py39+, and these tests still run on py38.
+    traces = await asyncio.get_event_loop().run_in_executor(
+        None, functools.partial(get_traces, tempo_host, service_name=service_name, tls=tls)
+    )
     assert len(traces) > 0
     return traces
 
@@ -2,19 +2,17 @@
 # See LICENSE file for licensing details.
 import asyncio
 import subprocess
-import time
-import urllib.request
-from urllib.error import HTTPError
 
 import pytest
 import yaml
 from pytest_operator.plugin import OpsTest
-from tenacity import retry, stop_after_delay
+from tenacity import retry, stop_after_delay, wait_exponential, wait_random
 
 from tests.integration.conftest import (
     get_relation_data,
     trfk_resources,
 )
+from tests.integration.helpers import http_session
 
 USERNAME = "admin"
 PASSWORD = "admin"
@@ -56,32 +54,20 @@ def get_tester_url(model):
     return provider_app_data["url"]
 
 
-@retry(stop=stop_after_delay(60 * 1))  # 5 minutes
+@retry(
+    # Retry quickly at first (the config is usually applied by then), backing off up to 2s.
+    wait=wait_exponential(multiplier=0.1, min=0.1, max=2) + wait_random(0, 0.1),
+    stop=stop_after_delay(60 * 1),  # 1 minute
+    reraise=True,
+)
 def assert_get_url_returns(url: str, expected: int, auth: str = None):
     print(f"attempting to curl {url} (with auth? {'yes' if auth else 'no'})")
-    if auth:
-        passman = urllib.request.HTTPPasswordMgrWithDefaultRealm()
-        passman.add_password(None, url, USERNAME, PASSWORD)
-        authhandler = urllib.request.HTTPBasicAuthHandler(passman)
-        opener = urllib.request.build_opener(authhandler)
-        urllib.request.install_opener(opener)
-
-    try:
-        urllib.request.urlopen(url, timeout=1)
-    except HTTPError as e:
-        if e.code == expected:
-            return True
-
-        print(f"unexpected exit code {e.code}")
-        time.sleep(0.1)
+    # Reuse the pooled session, so that retries don't open a new connection every time.
+    resp = http_session.get(url, timeout=2, auth=(USERNAME, PASSWORD) if auth else None)
+    if resp.status_code != expected:
+        print(f"unexpected exit code {resp.status_code}")
         raise AssertionError
-
-    if expected == 200:
-        return True
-
-    print("unexpected 200")
-    time.sleep(0.1)
-    raise AssertionError
+    return True
 
 
 @pytest.fixture
@@ -89,26 +75,29 @@ def model(ops_test):
     return ops_test.model_full_name
 
 
+@pytest.fixture(scope="module")
+def tester_url(ops_test):
+    # The ingressed url doesn't change with the auth config: look it up once for all tests.
+    return get_tester_url(ops_test.model_full_name)
+
+
 def set_basic_auth(model: str, user: str):
     print(f"setting basic auth to {user!r}")
     option = f"basic_auth_user={user}" if user else "basic_auth_user="
     subprocess.run(["juju", "config", "-m", model, APP_NAME, option])
 
 
-def test_ipa_charm_ingress_noauth(model):
+def test_ipa_charm_ingress_noauth(model, tester_url):
     # GIVEN basic auth is disabled (initial condition)
     set_basic_auth(model, "")
-    tester_url = get_tester_url(model)
 
     # WHEN we GET the tester url
     # THEN we get it fine
     assert_get_url_returns(tester_url, expected=SUCCESS_EXIT_CODE)
 
 
-def test_ipa_charm_ingress_auth(model):
+def test_ipa_charm_ingress_auth(model, tester_url):
     # GIVEN basic auth is disabled (previous test)
-    tester_url = get_tester_url(model)
-
     # WHEN we enable basic auth
     set_basic_auth(model, TEST_AUTH_USER)
 
@@ -121,10 +110,8 @@ def test_ipa_charm_ingress_auth(model):
     assert_get_url_returns(tester_url, expected=SUCCESS_EXIT_CODE, auth=TEST_AUTH_USER)
 
 
-def test_ipa_charm_ingress_auth_disable(model):
+def test_ipa_charm_ingress_auth_disable(model, tester_url):
     # GIVEN auth is enabled (previous test)
-    tester_url = get_tester_url(model)
-
     # WHEN we disable it again
     set_basic_auth(model, "")
 
@@ -3,6 +3,7 @@
 import asyncio
 import shlex
 import urllib.error
+from functools import partial
 from subprocess import PIPE, Popen
 from urllib.request import Request, urlopen
 
@@ -77,7 +78,7 @@ async def test_added_entrypoint_reachable(ops_test: OpsTest):
     req = Request(f"http://{traefik_ip}:4545")
 
     with pytest.raises(urllib.error.HTTPError, match="404"):
-        urlopen(req, timeout=60)
+        await asyncio.get_event_loop().run_in_executor(None, partial(urlopen, req, timeout=60))
 
 
 @pytest.mark.teardown
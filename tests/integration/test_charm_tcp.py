@@ -10,6 +10,7 @@ from pytest_operator.plugin import OpsTest
 
 from tests.integration.conftest import deploy_traefik_if_not_deployed, get_relation_data
 from tests.integration.helpers import (
+    charm_resources,
     delete_k8s_service,
     get_k8s_service_address,
     remove_application,
@@ -19,10 +20,7 @@ logger = logging.getLogger(__name__)
 
 
 tcp_charm_root = (Path(__file__).parent / "testers" / "tcp").absolute()
-tcp_charm_meta = yaml.safe_load((tcp_charm_root / "metadata.yaml").read_text())
-tcp_charm_resources = {
-    name: val["upstream-source"] for name, val in tcp_charm_meta["resources"].items()
-}
+tcp_charm_resources = charm_resources(tcp_charm_root)
 
 
 @pytest.mark.abort_on_fail
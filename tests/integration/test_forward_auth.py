@@ -1,19 +1,27 @@
 # Copyright 2023 Canonical Ltd.
 # See LICENSE file for licensing details.
+import asyncio
 import json
 import logging
+import time
 from os.path import join
 
+import httpx
 import pytest
-import requests
 import yaml
-from helpers import delete_k8s_service, get_k8s_service_address, remove_application
-from lightkube import Client
-from lightkube.resources.core_v1 import ConfigMap
+from helpers import (
+    SafeDumper,
+    SafeLoader,
+    delete_k8s_service,
+    get_k8s_service_address,
+    http_session,
+    remove_application,
+)
+from lightkube import AsyncClient
+from lightkube.resources.core_v1 import ConfigMap, Pod
+from lightkube.types import PatchType
 from pytest_operator.plugin import OpsTest
-from tenacity import retry, stop_after_attempt, wait_exponential
-
-from tests.integration.conftest import deploy_traefik_if_not_deployed
+from tenacity import retry, stop_after_attempt, wait_random_exponential
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +31,20 @@ IAP_REQUIRER_CHARM = "iap-requirer"
 
 
 @pytest.fixture(scope="module")
-def lightkube_client(ops_test: OpsTest) -> Client:
-    client = Client(field_manager=OATHKEEPER_CHARM, namespace=ops_test.model.name)
-    return client
+async def lightkube_client(ops_test: OpsTest):
+    client = AsyncClient(field_manager=OATHKEEPER_CHARM, namespace=ops_test.model.name)
+    yield client
+    await client.close()
+
+
+@pytest.fixture(scope="module")
+async def http_client():
+    # Shared across the module so that the connection pool (and TLS session) is reused.
+    # Follow redirects like requests did, so the tests check the final response, not the first hop.
+    async with httpx.AsyncClient(
+        verify=False, timeout=httpx.Timeout(10, connect=5), follow_redirects=True
+    ) as client:
+        yield client
 
 
 async def get_reverse_proxy_app_url(
@@ -38,25 +57,17 @@ async def get_reverse_proxy_app_url(
     return proxy_app_url
 
 
+@pytest.fixture(scope="module")
+async def requirer_url(ops_test: OpsTest) -> str:
+    # The ingress address does not change for the lifetime of the module, so look it up once.
+    return await get_reverse_proxy_app_url(ops_test, TRAEFIK_CHARM, IAP_REQUIRER_CHARM)
+
+
 @pytest.mark.skip_if_deployed
 @pytest.mark.abort_on_fail
-async def test_deployment(ops_test: OpsTest, traefik_charm, forward_auth_tester_charm):
+async def test_deployment(ops_test: OpsTest, oathkeeper_attached, forward_auth_tester_charm):
     """Deploy the charms and integrations required to set up an Identity and Access Proxy."""
-    await deploy_traefik_if_not_deployed(ops_test, traefik_charm)
-
-    # Enable experimental-forward-auth
-    await ops_test.model.applications[TRAEFIK_CHARM].set_config(
-        {"enable_experimental_forward_auth": "True"}
-    )
-
-    # Deploy oathkeeper
-    await ops_test.model.deploy(
-        OATHKEEPER_CHARM,
-        channel="latest/edge",
-        config={"dev": "True"},
-        trust=True,
-    )
-
+    # Traefik and oathkeeper are set up by the `oathkeeper_attached` fixture.
     # Deploy the iap-requirer charm with integrations
     await ops_test.model.deploy(
         application_name=IAP_REQUIRER_CHARM,
@@ -65,10 +76,10 @@ async def test_deployment(ops_test: OpsTest, traefik_charm, forward_auth_tester_
         trust=True,
     )
 
-    await ops_test.model.integrate(f"{IAP_REQUIRER_CHARM}:ingress", TRAEFIK_CHARM)
-    await ops_test.model.integrate(f"{IAP_REQUIRER_CHARM}:auth-proxy", OATHKEEPER_CHARM)
-
-    await ops_test.model.integrate(f"{TRAEFIK_CHARM}:experimental-forward-auth", OATHKEEPER_CHARM)
+    await asyncio.gather(
+        ops_test.model.integrate(f"{IAP_REQUIRER_CHARM}:ingress", TRAEFIK_CHARM),
+        ops_test.model.integrate(f"{IAP_REQUIRER_CHARM}:auth-proxy", OATHKEEPER_CHARM),
+    )
 
     # The auth lib uses event deferral, so by extension it depends on the update-status hook.
     # As a result, when we use our 60m interval from the autouse fixture, test occasionally fail.
@@ -81,42 +92,46 @@ async def test_deployment(ops_test: OpsTest, traefik_charm, forward_auth_tester_
 
 
 @retry(
-    wait=wait_exponential(multiplier=3, min=1, max=30),
+    wait=wait_random_exponential(multiplier=1, max=30),
     stop=stop_after_attempt(30),
     reraise=True,
 )
-async def test_allowed_forward_auth_url_redirect(ops_test: OpsTest) -> None:
+async def test_allowed_forward_auth_url_redirect(
+    requirer_url: str, http_client: httpx.AsyncClient
+) -> None:
     """Test that a request hitting an application protected by IAP is forwarded by traefik to oathkeeper.
 
     An allowed request should be performed without authentication.
     Retry the request to ensure the access rules were populated by oathkeeper.
     """
-    requirer_url = await get_reverse_proxy_app_url(ops_test, TRAEFIK_CHARM, IAP_REQUIRER_CHARM)
-
     protected_url = join(requirer_url, "anything/allowed")
 
-    resp = requests.get(protected_url, verify=False)
+    resp = await http_client.get(protected_url)
     assert resp.status_code == 200
 
 
-async def test_protected_forward_auth_url_redirect(ops_test: OpsTest) -> None:
+@retry(
+    wait=wait_random_exponential(max=5),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+async def test_protected_forward_auth_url_redirect(
+    requirer_url: str, http_client: httpx.AsyncClient
+) -> None:
     """Test that when trying to reach a protected url, the request is forwarded by traefik to oathkeeper.
 
     An unauthenticated request should then be denied with 401 Unauthorized response.
     """
-    requirer_url = await get_reverse_proxy_app_url(ops_test, TRAEFIK_CHARM, IAP_REQUIRER_CHARM)
-
     protected_url = join(requirer_url, "anything/deny")
 
-    resp = requests.get(protected_url, verify=False)
+    resp = await http_client.get(protected_url)
     assert resp.status_code == 401
 
 
 async def test_forward_auth_url_response_headers(
-    ops_test: OpsTest, lightkube_client: Client
+    ops_test: OpsTest, lightkube_client: AsyncClient, requirer_url: str
 ) -> None:
     """Test that a response mutated by oathkeeper contains expected custom headers."""
-    requirer_url = await get_reverse_proxy_app_url(ops_test, TRAEFIK_CHARM, IAP_REQUIRER_CHARM)
     protected_url = join(requirer_url, "anything/anonymous")
 
     # Push an anonymous access rule as a workaround to avoid deploying identity-platform bundle
@@ -134,19 +149,22 @@ async def test_forward_auth_url_response_headers(
         }
     ]
 
-    update_access_rules_configmap(ops_test, lightkube_client, rule=anonymous_rule)
-    update_config_configmap(ops_test, lightkube_client)
+    await asyncio.gather(
+        update_access_rules_configmap(ops_test, lightkube_client, rule=anonymous_rule),
+        update_config_configmap(ops_test, lightkube_client),
+    )
+    await trigger_configmap_sync(ops_test, lightkube_client)
 
-    assert_anonymous_response(protected_url)
+    await asyncio.get_event_loop().run_in_executor(None, assert_anonymous_response, protected_url)
 
 
 @retry(
-    wait=wait_exponential(multiplier=3, min=1, max=30),
+    wait=wait_random_exponential(multiplier=1, max=30),
     stop=stop_after_attempt(30),
     reraise=True,
 )
 def assert_anonymous_response(url):
-    resp = requests.get(url, verify=False)
+    resp = http_session.get(url, timeout=(5, 10))
     assert resp.status_code == 200
 
     headers = json.loads(resp.content).get("headers")
@@ -154,39 +172,65 @@ def assert_anonymous_response(url):
 
 
 @retry(
-    wait=wait_exponential(multiplier=3, min=1, max=10),
+    wait=wait_random_exponential(multiplier=1, max=10),
     stop=stop_after_attempt(5),
     reraise=True,
 )
-def update_access_rules_configmap(ops_test: OpsTest, lightkube_client: Client, rule):
+async def update_access_rules_configmap(ops_test: OpsTest, lightkube_client: AsyncClient, rule):
     """Modify the configmap to force access rules update.
 
     This is a workaround to test response headers without deploying identity-platform bundle.
     The anonymous authenticator is used only for testing purposes.
     """
-    cm = lightkube_client.get(ConfigMap, "access-rules", namespace=ops_test.model.name)
-    data = {"access-rules-iap-requirer-anonymous.json": str(rule)}
-    cm.data = data
-    lightkube_client.replace(cm)
+    # Server-side apply: a single round trip, and no read-modify-write to conflict on.
+    patch = {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {"name": "access-rules"},
+        "data": {"access-rules-iap-requirer-anonymous.json": str(rule)},
+    }
+    await lightkube_client.patch(
+        ConfigMap,
+        name="access-rules",
+        namespace=ops_test.model.name,
+        obj=patch,
+        patch_type=PatchType.APPLY,
+        force=True,
+    )
 
 
 @retry(
-    wait=wait_exponential(multiplier=3, min=1, max=10),
+    wait=wait_random_exponential(multiplier=1, max=10),
     stop=stop_after_attempt(5),
     reraise=True,
 )
-def update_config_configmap(ops_test: OpsTest, lightkube_client: Client):
-    cm = lightkube_client.get(ConfigMap, name="oathkeeper-config", namespace=ops_test.model.name)
-    cm = yaml.safe_load(cm.data["oathkeeper.yaml"])
+async def update_config_configmap(ops_test: OpsTest, lightkube_client: AsyncClient):
+    cm = await lightkube_client.get(
+        ConfigMap, name="oathkeeper-config", namespace=ops_test.model.name
+    )
+    cm = yaml.load(cm.data["oathkeeper.yaml"], Loader=SafeLoader)
     cm["access_rules"]["repositories"] = [
         "file://etc/config/access-rules/access-rules-iap-requirer-anonymous.json"
     ]
-    patch = {"data": {"oathkeeper.yaml": yaml.dump(cm)}}
-    lightkube_client.patch(
+    patch = {"data": {"oathkeeper.yaml": yaml.dump(cm, Dumper=SafeDumper)}}
+    await lightkube_client.patch(
         ConfigMap, name="oathkeeper-config", namespace=ops_test.model.name, obj=patch
     )
 
 
+async def trigger_configmap_sync(ops_test: OpsTest, lightkube_client: AsyncClient):
+    """Make kubelet project the updated configmaps into the oathkeeper pod right away.
+
+    Kubelet refreshes configmap volumes on its periodic sync (up to a minute, plus its cache TTL),
+    unless the pod itself is updated. Bumping an annotation triggers that refresh immediately,
+    instead of having `assert_anonymous_response` poll until the periodic sync happens.
+    """
+    patch = {"metadata": {"annotations": {"traefik-k8s.tests/configmap-sync": str(time.time())}}}
+    await lightkube_client.patch(
+        Pod, name=f"{OATHKEEPER_CHARM}-0", namespace=ops_test.model.name, obj=patch
+    )
+
+
 async def test_remove_forward_auth_integration(ops_test: OpsTest):
     await ops_test.juju("remove-relation", "oathkeeper", "traefik-k8s:experimental-forward-auth")
     await ops_test.model.wait_for_idle(
@@ -0,0 +1,84 @@
+# Copyright 2022 Canonical Ltd.
+# See LICENSE file for licensing details.
+"""Check that tcp ingress-per-unit and http ingress can coexist on the same traefik."""
+
+import asyncio
+
+import pytest_asyncio
+from pytest_operator.plugin import OpsTest
+
+from tests.integration.conftest import (
+    deploy_charm_if_not_deployed,
+    deploy_traefik_if_not_deployed,
+    safe_relate,
+)
+from tests.integration.helpers import (
+    delete_k8s_service,
+    forget_settled,
+    remove_application,
+)
+from tests.integration.test_charm_ipa import assert_ipa_charm_has_ingress
+from tests.integration.test_charm_ipu import assert_ipu_charm_has_ingress
+from tests.integration.test_charm_tcp import (
+    assert_tcp_charm_has_ingress,
+    tcp_charm_resources,
+)
+
+# http tester app name -> (ingress endpoint, on both the tester and traefik; ingress assertion)
+HTTP_TESTERS = {
+    "ipa-tester": ("ingress", assert_ipa_charm_has_ingress),
+    "ipu-tester": ("ingress-per-unit", assert_ipu_charm_has_ingress),
+}
+
+
+@pytest_asyncio.fixture(params=list(HTTP_TESTERS))
+async def tcp_http_deployment(
+    request,
+    ops_test: OpsTest,
+    traefik_charm,
+    tcp_tester_charm,
+    ipa_tester_charm,
+    ipu_tester_charm,
+):
+    http_tester = request.param
+    http_tester_charms = {"ipa-tester": ipa_tester_charm, "ipu-tester": ipu_tester_charm}
+    endpoint, _ = HTTP_TESTERS[http_tester]
+
+    await asyncio.gather(
+        deploy_traefik_if_not_deployed(ops_test, traefik_charm),
+        deploy_charm_if_not_deployed(
+            ops_test, tcp_tester_charm, "tcp-tester", resources=tcp_charm_resources
+        ),
+        deploy_charm_if_not_deployed(ops_test, http_tester_charms[http_tester], http_tester),
+    )
+    await asyncio.gather(
+        safe_relate(ops_test, "tcp-tester:ingress-per-unit", "traefik-k8s:ingress-per-unit"),
+        safe_relate(ops_test, f"{http_tester}:{endpoint}", f"traefik-k8s:{endpoint}"),
+    )
+
+    # Use "idle_period" to make sure traefik is functioning
+    # Otherwise, occasionally getting "Connection refused"
+    await ops_test.model.wait_for_idle(
+        ["traefik-k8s", "tcp-tester", http_tester],
+        status="active",
+        timeout=3000,
+        idle_period=30,
+    )
+
+    yield http_tester
+
+    # The tcp tester is shared by all the parametrizations; only the http tester is swapped.
+    forget_settled(ops_test, http_tester)
+    await ops_test.model.applications[http_tester].remove()
+
+
+async def test_tcp_http_compatibility(ops_test, tcp_http_deployment):
+    _, assert_http_charm_has_ingress = HTTP_TESTERS[tcp_http_deployment]
+    await assert_tcp_charm_has_ingress(ops_test)
+    assert_http_charm_has_ingress(ops_test)
+
+
+async def test_cleanup(ops_test):
+    await delete_k8s_service(ops_test, "traefik-k8s-lb")
+    await remove_application(ops_test, "tcp-tester", timeout=60)
+    await remove_application(ops_test, "traefik-k8s", timeout=60)
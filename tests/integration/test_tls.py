@@ -15,15 +15,16 @@ NOTE: This module implicitly relies on in-order execution (test running in the o
 
 import asyncio
 import logging
+import ssl
 from pathlib import Path
 from types import SimpleNamespace
-from urllib.request import urlopen
 
+import httpx
 import pytest
-import yaml
 from pytest_operator.plugin import OpsTest
 
 from tests.integration.helpers import (
+    charm_resources,
     delete_k8s_service,
     get_k8s_service_address,
     remove_application,
@@ -33,9 +34,7 @@ logger = logging.getLogger(__name__)
 
 idle_period = 90
 
-METADATA = yaml.safe_load(Path("./metadata.yaml").read_text())
-resources = {"traefik-image": METADATA["resources"]["traefik-image"]["upstream-source"]}
-trfk = SimpleNamespace(name="traefik", resources=resources)
+trfk = SimpleNamespace(name="traefik", resources=charm_resources())
 mock_hostname = "juju.local"  # For TLS
 
 ipu = SimpleNamespace(charm="ch:prometheus-k8s", name="prometheus")  # per unit
@@ -55,6 +54,12 @@ def get_endpoints(ops_test: OpsTest, *, scheme: str, netloc: str) -> list:
     ]
 
 
+@pytest.fixture(scope="module")
+async def traefik_ip(ops_test: OpsTest) -> str:
+    # The LoadBalancer address doesn't change once assigned, so look it up once per module.
+    return await get_k8s_service_address(ops_test, f"{trfk.name}-lb")
+
+
 @pytest.mark.abort_on_fail
 async def test_build_and_deploy(ops_test: OpsTest, traefik_charm):
     await asyncio.gather(
@@ -79,8 +84,14 @@ async def test_build_and_deploy(ops_test: OpsTest, traefik_charm):
         ),
     )
 
+    # The ingress requirers may go through transient errors while they come up, so let the
+    # deployments settle without failing on them before relating.
     await ops_test.model.wait_for_idle(
-        status="active", timeout=600, idle_period=30, raise_on_error=False
+        apps=[trfk.name, ipu.name, ipa.name, ipr.name],
+        status="active",
+        timeout=600,
+        idle_period=30,
+        raise_on_error=False,
     )
 
     await asyncio.gather(
@@ -89,44 +100,50 @@ async def test_build_and_deploy(ops_test: OpsTest, traefik_charm):
         ops_test.model.add_relation(f"{ipr.name}:ingress", trfk.name),
     )
 
-    await ops_test.model.wait_for_idle(status="active", timeout=600, idle_period=30)
+    # Only wait for the apps under test (not for whatever else lives in the model).
+    await ops_test.model.wait_for_idle(
+        apps=[trfk.name, ipu.name, ipa.name, ipr.name],
+        status="active",
+        timeout=600,
+        idle_period=30,
+        wait_for_exact_units=1,
+    )
 
 
 @pytest.mark.abort_on_fail
-async def test_ingressed_endpoints_reachable_after_metallb_enabled(ops_test: OpsTest):
-    ip = await get_k8s_service_address(ops_test, f"{trfk.name}-lb")
-    for ep in get_endpoints(ops_test, scheme="http", netloc=ip):
-        logger.info("Attempting to reach %s", ep)  # Traceback doesn't spell out the endpoint
-        urlopen(ep)
-
-
-async def curl_endpoints(ops_test: OpsTest, certs_dir, cert_path, traefik_app_ip):
-    for endpoint in get_endpoints(ops_test, scheme="https", netloc=mock_hostname):
-        # Tell curl to resolve the mock_hostname as traefik's IP (to avoid using a custom DNS
-        # server). This is needed because the certificate issued by the CA would have that same
-        # hostname as the subject, and for TLS to succeed, the target url's hostname must match
-        # the one in the certificate.
-        cmd = [
-            "curl",
-            "-s",
-            "--fail-with-body",
-            "--resolve",
-            f"{mock_hostname}:443:{traefik_app_ip}",
-            "--capath",
-            certs_dir,
-            "--cacert",
-            cert_path,
-            endpoint,
-        ]
-
-        rc, stdout, stderr = await ops_test.run(*cmd)
-        logger.info("%s: %s", endpoint, (rc, stdout, stderr))
-        assert rc == 0, (
-            f"curl exited with rc={rc} for {endpoint}; "
-            f"non-zero return code means curl encountered a >= 400 HTTP code; "
-            f"cmd={cmd}"
+async def test_ingressed_endpoints_reachable_after_metallb_enabled(
+    ops_test: OpsTest, traefik_ip: str
+):
+    endpoints = get_endpoints(ops_test, scheme="http", netloc=traefik_ip)
+    # Follow redirects, as urlopen did, so that the final response's status is the one checked.
+    async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+        responses = await asyncio.gather(*(client.get(ep) for ep in endpoints))
+
+    for endpoint, resp in zip(endpoints, responses):
+        assert resp.status_code < 400, f"GET {endpoint} returned {resp.status_code}"
+
+
+async def assert_tls_endpoints_reachable(ops_test: OpsTest, certs_dir, cert_path, traefik_app_ip):
+    # Connect to traefik's IP, but present the mock_hostname for SNI, certificate validation and
+    # routing (to avoid using a custom DNS server). This is needed because the certificate issued
+    # by the CA would have that same hostname as the subject, and for TLS to succeed, the target
+    # url's hostname must match the one in the certificate.
+    ssl_context = ssl.create_default_context(cafile=str(cert_path), capath=str(certs_dir))
+    endpoints = get_endpoints(ops_test, scheme="https", netloc=traefik_app_ip)
+
+    async with httpx.AsyncClient(verify=ssl_context, headers={"Host": mock_hostname}) as client:
+        # A single client, so that the requests share the connection (and TLS handshake).
+        responses = await asyncio.gather(
+            *(client.get(ep, extensions={"sni_hostname": mock_hostname}) for ep in endpoints)
         )
 
+    for endpoint, resp in zip(endpoints, responses):
+        logger.debug("%s: %s", endpoint, resp.status_code)
+        # The body may be a whole html error page; the first few hundred bytes tell the story.
+        assert (
+            resp.status_code < 400
+        ), f"GET {endpoint} (as {mock_hostname}) returned {resp.status_code}: {resp.text[:256]}"
+
         # fixme:
         #          sans:
         #          - '*.juju.local'
@@ -137,52 +154,47 @@ async def curl_endpoints(ops_test: OpsTest, certs_dir, cert_path, traefik_app_ip
 
 
 async def pull_server_cert(ops_test, path):
-    # Get self-signed cert from peer app data
-    rc, stdout, stderr = await ops_test.run(
-        "juju",
-        "ssh",
+    # Copy the cert over as a file, rather than round-tripping it through `juju ssh cat`'s stdout.
+    # (libjuju's Unit.scp_from can't target a sidecar container, hence the cli.)
+    await ops_test.juju(
+        "scp",
         "--container=traefik",
-        f"{trfk.name}/0",
-        "cat",
-        "/opt/traefik/juju/server.cert",
+        f"{trfk.name}/0:/opt/traefik/juju/server.cert",
+        str(path),
+        check=True,
     )
-    logger.info(f"pulled server cert from traefik: {stdout[:100]}...")
-    with open(path, "wt") as f:
-        f.writelines(stdout)
+    logger.info(f"pulled server cert from traefik: {path.read_text()[:100]}...")
 
-        # fixme:
-        #          sans:
-        #          - '*.juju.local'
-        #  services:
-        #    juju-test-tls-yuh5-alertmanager-service:
-        #      loadBalancer:
-        #        servers: []  # should not be empty!
+    # fixme:
+    #          sans:
+    #          - '*.juju.local'
+    #  services:
+    #    juju-test-tls-yuh5-alertmanager-service:
+    #      loadBalancer:
+    #        servers: []  # should not be empty!
+
+
+async def get_server_cert(ops_test, certs_dir: Path) -> Path:
+    """Pull traefik's server cert into certs_dir, unless an earlier test in the module did."""
+    cert_path = certs_dir / "local.cert"
+    if not cert_path.exists():
+        await pull_server_cert(ops_test, cert_path)
+    return cert_path
 
 
 @pytest.mark.abort_on_fail
-async def test_tls_termination(ops_test: OpsTest, temp_dir):
+async def test_tls_termination(ops_test: OpsTest, temp_dir, traefik_ip: str, root_ca: str):
     # TODO move this to the bundle tests
     await ops_test.model.applications[trfk.name].set_config({"external_hostname": mock_hostname})
 
-    await ops_test.model.deploy(
-        "ch:self-signed-certificates",
-        application_name="root-ca",
-        channel="edge",
-    )
-    await ops_test.model.applications["root-ca"].set_config(
-        {
-            "ca-common-name": "demo.ca.local",
-        }
+    await ops_test.model.add_relation(root_ca, f"{trfk.name}:certificates")
+    # Only the two ends of the certificates relation need to settle before pulling the cert.
+    await ops_test.model.wait_for_idle(
+        apps=[root_ca, trfk.name], status="active", timeout=300, idle_period=10
     )
-    await ops_test.model.add_relation("root-ca", f"{trfk.name}:certificates")
-    await ops_test.model.wait_for_idle(status="active", timeout=300)
 
-    # Get self-signed cert from peer app data
-    cert_path = temp_dir / "local.cert"
-    await pull_server_cert(ops_test, cert_path)
-
-    ip = await get_k8s_service_address(ops_test, f"{trfk.name}-lb")
-    await curl_endpoints(ops_test, temp_dir, cert_path, ip)
+    cert_path = await get_server_cert(ops_test, temp_dir)
+    await assert_tls_endpoints_reachable(ops_test, temp_dir, cert_path, traefik_ip)
 
 
 # @pytest.mark.abort_on_fail
@@ -191,24 +203,30 @@ async def test_tls_termination_after_charm_upgrade(
     ops_test: OpsTest,
     traefik_charm,
     temp_dir,
+    traefik_ip: str,
 ):
     logger.info(
         "Refreshing charm to test TLS termination still works with the same certificate after"
         " charm upgrade..."
     )
-    await ops_test.model.applications[trfk.name].refresh(
-        path=traefik_charm, resources=trfk.resources
-    )
-    # insanely high wait period otherwise for some reason it won't work?
-    await ops_test.model.wait_for_idle(status="active", timeout=600, idle_period=10)
-
-    cert_path = temp_dir / "local.cert"
-    if not cert_path.exists():  # allow running this test in isolation for debugging
-        await pull_server_cert(ops_test, cert_path)
+    app = ops_test.model.applications[trfk.name]
+    pre_upgrade_url = app.charm_url
+    await app.refresh(path=traefik_charm, resources=trfk.resources)
+
+    def upgraded():
+        # The app's charm url flips as soon as the refresh lands; wait for the units to run it.
+        return app.charm_url != pre_upgrade_url and all(
+            unit.safe_data.get("charm-url") == app.charm_url
+            and unit.workload_status == "active"
+            and unit.agent_status == "idle"
+            for unit in app.units
+        )
 
-    ip = await get_k8s_service_address(ops_test, f"{trfk.name}-lb")
+    await ops_test.model.block_until(upgraded, timeout=300)
 
-    await curl_endpoints(ops_test, temp_dir, temp_dir / "local.cert", ip)
+    # Same certificate as before the upgrade; pulled here only if this test runs in isolation.
+    cert_path = await get_server_cert(ops_test, temp_dir)
+    await assert_tls_endpoints_reachable(ops_test, temp_dir, cert_path, traefik_ip)
 
 
 async def test_disintegrate(ops_test: OpsTest):
@@ -217,5 +235,8 @@ async def test_disintegrate(ops_test: OpsTest):
 
 
 async def test_cleanup(ops_test):
+    if not ops_test.keep_model:
+        # pytest-operator is about to destroy the model, and everything in it, anyway.
+        return
     await delete_k8s_service(ops_test, "traefik-lb")
     await remove_application(ops_test, "traefik", timeout=60)
@@ -2,21 +2,27 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import asyncio
 import logging
-from pathlib import Path
 
 import pytest
-import yaml
-from helpers import deploy_tempo_cluster, get_application_ip, get_traces_patiently
+from helpers import (
+    charm_resources,
+    deploy_tempo_cluster,
+    get_application_ip,
+    get_traces_patiently,
+)
 
 logger = logging.getLogger(__name__)
 
-METADATA = yaml.safe_load(Path("./metadata.yaml").read_text())
 APP_NAME = "traefik"
 TEMPO_APP_NAME = "tempo"
-RESOURCES = {
-    "traefik-image": METADATA["resources"]["traefik-image"]["upstream-source"],
-}
+
+
+@pytest.fixture(scope="session")
+def resources():
+    # Resolved on first use rather than at import, so merely collecting this module stays cheap.
+    return charm_resources()
 
 
 async def test_setup_env(ops_test):
@@ -24,27 +30,28 @@ async def test_setup_env(ops_test):
 
 
 @pytest.mark.abort_on_fail
-async def test_workload_tracing_is_present(ops_test, traefik_charm):
-    logger.info("deploying tempo cluster")
-    await deploy_tempo_cluster(ops_test)
-
-    logger.info("deploying local charm")
-    await ops_test.model.deploy(
-        traefik_charm, resources=RESOURCES, application_name=APP_NAME, trust=True
-    )
-    await ops_test.model.wait_for_idle(
-        apps=[APP_NAME], status="active", timeout=300, wait_for_exact_units=1
+async def test_workload_tracing_is_present(ops_test, traefik_charm, resources):
+    logger.info("deploying tempo cluster and local charm")
+    await asyncio.gather(
+        deploy_tempo_cluster(ops_test),
+        ops_test.model.deploy(
+            traefik_charm, resources=resources, application_name=APP_NAME, trust=True
+        ),
     )
 
-    # we relate _only_ workload tracing not to confuse with charm traces
-    await ops_test.model.add_relation(
-        "{}:workload-tracing".format(APP_NAME), "{}:tracing".format(TEMPO_APP_NAME)
-    )
-    # but we also relate tempo to route through traefik so there's any traffic to generate traces from
-    await ops_test.model.add_relation(
-        "{}:ingress".format(TEMPO_APP_NAME), "{}:traefik-route".format(APP_NAME)
+    # no need to wait for traefik to settle first: the relation events queue up until it does
+    await asyncio.gather(
+        # we relate _only_ workload tracing not to confuse with charm traces
+        ops_test.model.add_relation(
+            "{}:workload-tracing".format(APP_NAME), "{}:tracing".format(TEMPO_APP_NAME)
+        ),
+        # but we also relate tempo to route through traefik so there's any traffic to generate
+        # traces from
+        ops_test.model.add_relation(
+            "{}:ingress".format(TEMPO_APP_NAME), "{}:traefik-route".format(APP_NAME)
+        ),
     )
-    await ops_test.model.wait_for_idle(apps=[APP_NAME], status="active")
+    await ops_test.model.wait_for_idle(apps=[APP_NAME], status="active", wait_for_exact_units=1)
 
     # Verify workload traces are ingested into Tempo
     assert await get_traces_patiently(
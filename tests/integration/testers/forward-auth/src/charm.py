@@ -32,19 +32,21 @@ class IAPRequirerMock(CharmBase):
         )
 
         self.auth_proxy_relation_name = "auth-proxy"
+        # Until ingress is ready there's no url to protect; the config is sent on ingress ready.
+        ingress_url = self.ingress.url
         self.auth_proxy = AuthProxyRequirer(
-            self, self._auth_proxy_config, self.auth_proxy_relation_name
+            self,
+            self._auth_proxy_config(ingress_url) if ingress_url else None,
+            self.auth_proxy_relation_name,
         )
 
         self.framework.observe(self.on.httpbin_pebble_ready, self._on_httpbin_pebble_ready)
         self.framework.observe(self.ingress.on.ready, self._on_ingress_ready)
 
-    @property
-    def _auth_proxy_config(self) -> AuthProxyConfig:
+    @staticmethod
+    def _auth_proxy_config(ingress_url: str) -> AuthProxyConfig:
         return AuthProxyConfig(
-            protected_urls=[
-                self.ingress.url if self.ingress.url is not None else "https://some-test-url.com"
-            ],
+            protected_urls=[ingress_url],
             headers=AUTH_PROXY_HEADERS,
             allowed_endpoints=AUTH_PROXY_ALLOWED_ENDPOINTS,
         )
@@ -75,7 +77,9 @@ class IAPRequirerMock(CharmBase):
     def _on_ingress_ready(self, event):
         if self.unit.is_leader():
             logger.info(f"This app's ingress URL: {event.url}")
-        self.auth_proxy.update_auth_proxy_config(auth_proxy_config=self._auth_proxy_config)
+        self.auth_proxy.update_auth_proxy_config(
+            auth_proxy_config=self._auth_proxy_config(event.url)
+        )
 
 
 if __name__ == "__main__":
@@ -8,6 +8,9 @@ from ops.charm import CharmBase, PebbleReadyEvent
 from ops.model import ActiveStatus, Container, WaitingStatus
 from ops.pebble import Layer
 
+WORKLOAD_FILE = Path(__file__).parent / "workload.py"
+WORKLOAD = WORKLOAD_FILE.read_bytes()
+
 
 class TCPRequirerMock(CharmBase):
     _tcp_port = 9999
@@ -32,10 +35,9 @@ class TCPRequirerMock(CharmBase):
             )
             return
 
-        workload_file = Path(__file__).parent / "workload.py"
-        with open(workload_file, "r") as workload_source:
-            print("pushing webserver source...")
-            container.push("/workload.py", workload_source)
+        print("pushing webserver source...")
+        # Push the raw bytes: no point decoding the script only for pebble to re-encode it.
+        container.push("/workload.py", WORKLOAD, make_dirs=True)
 
         new_layer = Layer(
             {
@@ -4,6 +4,9 @@
 
 import socketserver
 
+# Read up to a typical tcp receive window at a time, rather than 1KiB.
+BUFFER_SIZE = 64 * 1024
+
 
 class MyTCPHandler(socketserver.BaseRequestHandler):
     """The request handler class for our server.
@@ -13,8 +16,7 @@ class MyTCPHandler(socketserver.BaseRequestHandler):
 
     def handle(self):
         # self.request is the TCP socket connected to the client
-        self.data = self.request.recv(1024).strip()
-        print(f"{self.client_address[0]} wrote: {self.data}")
+        self.data = self.request.recv(BUFFER_SIZE).strip()
         # Send back the same data
         self.request.sendall(self.data)
 
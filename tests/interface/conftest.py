@@ -1,13 +1,86 @@
 # Copyright 2022 Canonical Ltd.
 # See LICENSE file for licensing details.
-from unittest.mock import patch
+import os
+import subprocess
+from pathlib import Path
 
 import pytest
 from interface_tester import InterfaceTester
 from ops.pebble import Layer
 from scenario.state import Container, ExecOutput, State
 
-from charm import TraefikIngressCharm
+INTERFACES_REPO = "https://github.com/canonical/charm-relation-interfaces"
+
+# Read-only templates: the tester copies the state before running anything against it.
+TRAEFIK_LAYER = Layer(
+    {
+        "summary": "foo",
+        "description": "bar",
+        "services": {
+            "traefik": {
+                "startup": "enabled",
+                "current": "active",
+                "name": "traefik",
+            }
+        },
+        "checks": {},
+    }
+)
+
+STATE_TEMPLATE = State(
+    leader=True,
+    config={
+        # if we don't pass external_hostname, we have to mock
+        # all sorts of lightkube calls
+        "external_hostname": "0.0.0.0",
+        # since we're passing a config, we have to provide all defaulted values
+        "routing_mode": "path",
+    },
+    containers=[
+        # unless the traefik service reports active, the
+        # charm won't publish the ingress url.
+        Container(
+            name="traefik",
+            can_connect=True,
+            exec_mock={
+                (
+                    "find",
+                    "/opt/traefik/juju",
+                    "-name",
+                    "*.yaml",
+                    "-delete",
+                ): ExecOutput()
+            },
+            layers={"foo": TRAEFIK_LAYER},
+        )
+    ],
+)
+
+
+@pytest.fixture(scope="session")
+def interfaces_repo(tmp_path_factory) -> str:
+    """A local checkout of charm-relation-interfaces, shared by all the interface tests.
+
+    Every interface test would otherwise clone the whole repo from github again. Point
+    `INTERFACES_REPO_PATH` at an existing checkout to skip the clone altogether.
+    """
+    checkout = os.environ.get("INTERFACES_REPO_PATH")
+    if checkout:
+        return f"file://{Path(checkout).resolve()}"
+
+    path = tmp_path_factory.mktemp("charm-relation-interfaces")
+    subprocess.run(["git", "clone", "--depth=1", INTERFACES_REPO, str(path)], check=True)
+    return f"file://{path}"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def no_load_balancer():
+    # Patched once for the whole module, rather than around every single interface test.
+    # Autouse, but interface_tester also requests it explicitly: charm-relation-interfaces' ci
+    # picks up that fixture on its own, and it must never run the charm unpatched.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("charm.KubernetesLoadBalancer", lambda **unused: None)
+        yield
 
 
 # Interface tests are centrally hosted at https://github.com/canonical/charm-relation-interfaces.
@@ -17,52 +90,9 @@ from charm import TraefikIngressCharm
 # https://github.com/canonical/charm-relation-interfaces and change traefik's test configuration
 # to include the new identifier/location.
 @pytest.fixture
-def interface_tester(interface_tester: InterfaceTester):
-    with patch("charm.KubernetesLoadBalancer", lambda **unused: None):
-        interface_tester.configure(
-            charm_type=TraefikIngressCharm,
-            state_template=State(
-                leader=True,
-                config={
-                    # if we don't pass external_hostname, we have to mock
-                    # all sorts of lightkube calls
-                    "external_hostname": "0.0.0.0",
-                    # since we're passing a config, we have to provide all defaulted values
-                    "routing_mode": "path",
-                },
-                containers=[
-                    # unless the traefik service reports active, the
-                    # charm won't publish the ingress url.
-                    Container(
-                        name="traefik",
-                        can_connect=True,
-                        exec_mock={
-                            (
-                                "find",
-                                "/opt/traefik/juju",
-                                "-name",
-                                "*.yaml",
-                                "-delete",
-                            ): ExecOutput()
-                        },
-                        layers={
-                            "foo": Layer(
-                                {
-                                    "summary": "foo",
-                                    "description": "bar",
-                                    "services": {
-                                        "traefik": {
-                                            "startup": "enabled",
-                                            "current": "active",
-                                            "name": "traefik",
-                                        }
-                                    },
-                                    "checks": {},
-                                }
-                            )
-                        },
-                    )
-                ],
-            ),
-        )
-        yield interface_tester
+def interface_tester(interface_tester: InterfaceTester, no_load_balancer):
+    # Imported here, so that merely collecting the tests doesn't pull in the charm's dependencies.
+    from charm import TraefikIngressCharm
+
+    interface_tester.configure(charm_type=TraefikIngressCharm, state_template=STATE_TEMPLATE)
+    yield interface_tester
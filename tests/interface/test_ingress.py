@@ -1,19 +1,18 @@
 # Copyright 2022 Canonical Ltd.
 # See LICENSE file for licensing details.
+import pytest
 from interface_tester import InterfaceTester
 
 
-def test_ingress_v1_interface(interface_tester: InterfaceTester):
+@pytest.mark.parametrize("interface_version", (1, 2), ids=("ingress_v1", "ingress_v2"))
+def test_ingress_interface(
+    interface_tester: InterfaceTester, interfaces_repo: str, interface_version: int
+):
     interface_tester.configure(
         interface_name="ingress",
-        interface_version=1,
-    )
-    interface_tester.run()
-
-
-def test_ingress_v2_interface(interface_tester: InterfaceTester):
-    interface_tester.configure(
-        interface_name="ingress",
-        interface_version=2,
+        interface_version=interface_version,
+        # Set here rather than in the interface_tester fixture, which charm-relation-interfaces'
+        # own ci uses to test against its branches.
+        repo=interfaces_repo,
     )
     interface_tester.run()
@@ -1,64 +1,137 @@
-from unittest.mock import PropertyMock, patch
+import functools
+from contextlib import ExitStack
+from unittest.mock import patch
 
 import pytest
 from ops import pebble
-from scenario import Container, Context, ExecOutput, Model, Mount
-
-from charm import TraefikIngressCharm
+from scenario import Container, Context, ExecOutput, Model, Mount, Relation, State
 
 MOCK_LB_ADDRESS = "1.2.3.4"
 
+# Built once: scenario works on a copy of the input state, so these are never mutated.
+TRAEFIK_LAYER = pebble.Layer(
+    {
+        "summary": "Traefik layer",
+        "description": "Pebble config layer for Traefik",
+        "services": {
+            "traefik": {
+                "override": "replace",
+                "summary": "Traefik",
+                "command": '/bin/sh -c "/usr/bin/traefik | tee /var/log/traefik.log"',
+                "startup": "enabled",
+            },
+        },
+    }
+)
+TRAEFIK_EXEC_MOCK = {
+    ("update-ca-certificates", "--fresh"): ExecOutput(),
+    ("find", "/opt/traefik/juju", "-name", "*.yaml", "-delete"): ExecOutput(),
+    ("/usr/bin/traefik", "version"): ExecOutput(stdout="42.42"),
+}
+# Most ingress tests only vary the containers and relations: they .replace() them in.
+PATH_ROUTING_STATE = State(
+    model=Model(name="test-model"),
+    config={"routing_mode": "path", "external_hostname": "foo.com"},
+)
 
-@pytest.fixture
+
+def single_unit_ipa_config(host: str, port: int, scheme: str = "http") -> dict:
+    """The dynamic config traefik generates for an ipa relation with a single remote unit."""
+    rule = "PathPrefix(`/test-model-remote-0`)"
+    service = "juju-test-model-remote-0-service"
+    load_balancer = {"servers": [{"url": f"{scheme}://{host}:{port}"}]}
+    cfg = {
+        "http": {
+            "routers": {
+                "juju-test-model-remote-0-router": {
+                    "entryPoints": ["web"],
+                    "rule": rule,
+                    "service": service,
+                },
+                "juju-test-model-remote-0-router-tls": {
+                    "entryPoints": ["websecure"],
+                    "rule": rule,
+                    "service": service,
+                    "tls": {"domains": [{"main": "foo.com", "sans": ["*.foo.com"]}]},
+                },
+            },
+            "services": {service: {"loadBalancer": load_balancer}},
+        }
+    }
+    if scheme == "https":
+        # traefik has no tls relation, but the requirer does: reverse termination case
+        load_balancer["serversTransport"] = "reverseTerminationTransport"
+        cfg["http"]["serversTransports"] = {
+            "reverseTerminationTransport": {"insecureSkipVerify": False}
+        }
+    return cfg
+
+
+# The patches are stateless across tests, so they only need applying once per module.
+# Not session-wide, so they don't leak into the unit tests.
+@pytest.fixture(scope="module")
 def traefik_charm():
-    with patch("lightkube.core.client.GenericSyncClient"):
-        with patch(
-            "charm.TraefikIngressCharm._get_loadbalancer_status",
-            new_callable=PropertyMock,
-            return_value=MOCK_LB_ADDRESS,
-        ):
-            yield TraefikIngressCharm
+    # Imported here, so that merely collecting the tests doesn't pull in the charm's dependencies.
+    from charm import TraefikIngressCharm
 
+    with ExitStack() as stack:
+        stack.enter_context(patch("lightkube.core.client.GenericSyncClient"))
+        # A plain property: nobody asserts on its calls, so no need for a PropertyMock.
+        stack.enter_context(
+            patch.object(
+                TraefikIngressCharm,
+                "_get_loadbalancer_status",
+                property(lambda _: MOCK_LB_ADDRESS),
+            )
+        )
+        yield TraefikIngressCharm
 
-@pytest.fixture
+
+@functools.lru_cache(maxsize=1)
+def _traefik_context(charm_type) -> Context:
+    # Context() loads and parses the charm's metadata, config and actions yaml; do that once.
+    return Context(charm_type=charm_type)
+
+
+@pytest.fixture(scope="module")
 def traefik_ctx(traefik_charm):
-    return Context(charm_type=traefik_charm)
+    return _traefik_context(traefik_charm)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _reset_traefik_ctx(request):
+    yield
+    # The context is shared, so drop what it recorded (juju-log, statuses, emitted events...)
+    # rather than letting it pile up over the session, or leak into the next test.
+    if "traefik_ctx" in request.fixturenames:
+        request.getfixturevalue("traefik_ctx").cleanup()
+
+
+@pytest.fixture(scope="session")
 def model():
     return Model(name="test-model")
 
 
 @pytest.fixture
 def traefik_container(tmp_path):
-    layer = pebble.Layer(
-        {
-            "summary": "Traefik layer",
-            "description": "Pebble config layer for Traefik",
-            "services": {
-                "traefik": {
-                    "override": "replace",
-                    "summary": "Traefik",
-                    "command": '/bin/sh -c "/usr/bin/traefik | tee /var/log/traefik.log"',
-                    "startup": "enabled",
-                },
-            },
-        }
-    )
-
     opt = Mount("/opt/", tmp_path)
     etc_traefik = Mount("/etc/traefik/", tmp_path)
 
     return Container(
         name="traefik",
         can_connect=True,
-        layers={"traefik": layer},
-        exec_mock={
-            ("update-ca-certificates", "--fresh"): ExecOutput(),
-            ("find", "/opt/traefik/juju", "-name", "*.yaml", "-delete"): ExecOutput(),
-            ("/usr/bin/traefik", "version"): ExecOutput(stdout="42.42"),
-        },
+        layers={"traefik": TRAEFIK_LAYER},
+        exec_mock=TRAEFIK_EXEC_MOCK,
         service_status={"traefik": pebble.ServiceStatus.ACTIVE},
         mounts={"opt": opt, "/etc/traefik": etc_traefik},
     )
+
+
+@pytest.fixture
+def ipu_empty():
+    return Relation(
+        endpoint="ingress-per-unit",
+        interface="ingress_per_unit",
+        remote_app_name="remote",
+        relation_id=0,
+    )
@@ -1,25 +1,35 @@
+import pytest
 from scenario import Relation, State
 
-
-def ipu():
-    return Relation(
-        endpoint="ingress-per-unit",
-        interface="ingress_per_unit",
-        remote_app_name="remote",
-        relation_id=0,
-        remote_units_data={
-            0: {
-                "port": "9999",
-                "host": '"host"',
-                "model": '"test-model"',
-                "name": '"remote/0"',
-            }
-        },
-    )
+# Relations are frozen, and scenario copies the state it's given: one instance serves every test.
+IPU = Relation(
+    endpoint="ingress-per-unit",
+    interface="ingress_per_unit",
+    remote_app_name="remote",
+    relation_id=0,
+    remote_units_data={
+        0: {
+            "port": "9999",
+            "host": '"host"',
+            "model": '"test-model"',
+            "name": '"remote/0"',
+        }
+    },
+)
+IPU_NO_UNITS = IPU.replace(remote_units_data={})
+
+
+@pytest.fixture
+def seeded_config_dir(tmp_path):
+    """The dynamic config dir, holding the ingress config a previous `IPU` event left behind."""
+    dynamic_config_dir = tmp_path / "traefik" / "juju"
+    dynamic_config_dir.mkdir(parents=True)
+    (dynamic_config_dir / f"juju_ingress_ingress-per-unit_{IPU.relation_id}_remote.yaml").touch()
+    return dynamic_config_dir
 
 
 def test_dynamic_config_create(traefik_container, traefik_ctx, tmp_path):
-    rel = ipu()
+    rel = IPU
     traefik_ctx.run(
         rel.created_event, State(relations=[rel], containers=[traefik_container], leader=True)
     )
@@ -30,39 +40,21 @@ def test_dynamic_config_create(traefik_container, traefik_ctx, tmp_path):
     assert files[0].name == f"juju_ingress_ingress-per-unit_{rel.relation_id}_remote.yaml"
 
 
-def test_dynamic_config_remove_on_broken(traefik_container, traefik_ctx, tmp_path):
-    dynamic_config_dir = tmp_path / "traefik" / "juju"
-    rel = ipu()
-    dynamic_config_dir.mkdir(parents=True)
-    ingress_config_fname = (
-        dynamic_config_dir / f"juju_ingress_ingress-per-unit_{rel.relation_id}_remote.yaml"
-    )
-    ingress_config_fname.touch()
-
+@pytest.mark.parametrize(
+    "relation, event",
+    (
+        (IPU, lambda rel: rel.broken_event),
+        (IPU_NO_UNITS, lambda rel: rel.departed_event(remote_unit_id=0)),
+    ),
+    ids=("broken", "departed"),
+)
+def test_dynamic_config_removed(
+    traefik_container, traefik_ctx, seeded_config_dir, relation, event
+):
     traefik_ctx.run(
-        rel.broken_event, State(relations=[rel], containers=[traefik_container], leader=True)
+        event(relation), State(relations=[relation], containers=[traefik_container], leader=True)
     )
 
-    assert dynamic_config_dir.exists()
-    files = list(dynamic_config_dir.iterdir())
-    assert len(files) == 0
-
-
-def test_dynamic_config_remove_on_departed(traefik_container, traefik_ctx, tmp_path):
-    dynamic_config_dir = tmp_path / "traefik" / "juju"
-    rel = ipu().replace(remote_units_data={})
-
-    dynamic_config_dir.mkdir(parents=True)
-    ingress_config_fname = (
-        dynamic_config_dir / f"juju_ingress_ingress-per-unit_{rel.relation_id}_remote.yaml"
-    )
-    ingress_config_fname.touch()
-
-    traefik_ctx.run(
-        rel.departed_event(remote_unit_id=0),
-        State(relations=[rel], containers=[traefik_container], leader=True),
-    )
-
-    assert dynamic_config_dir.exists()
-    files = list(dynamic_config_dir.iterdir())
+    assert seeded_config_dir.exists()
+    files = list(seeded_config_dir.iterdir())
     assert len(files) == 0
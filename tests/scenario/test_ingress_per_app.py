@@ -4,8 +4,6 @@
 # AND WHEN the charm rescales
 # THEN the traefik config file is updated
 import json
-import tempfile
-from pathlib import Path
 
 import pytest
 import yaml
@@ -18,25 +16,31 @@ from ops import CharmBase, Framework
 from scenario import Context, Model, Mount, Relation, State
 
 from tests.scenario._utils import create_ingress_relation
-from tests.scenario.conftest import MOCK_LB_ADDRESS
+from tests.scenario.conftest import (
+    MOCK_LB_ADDRESS,
+    PATH_ROUTING_STATE,
+    single_unit_ipa_config,
+)
 
 
+# The scheme (reverse termination or not) and the event are handled independently, so there's
+# no need for their full cross product: every event, scheme and address shows up at least once.
 @pytest.mark.parametrize(
-    "port, ip, host", ((80, "1.1.1.1", "1.1.1.1"), (81, "10.1.10.1", "10.1.10.1"))
+    "port, ip, host, event_name, scheme",
+    (
+        (80, "1.1.1.1", "1.1.1.1", "joined", "http"),
+        (81, "10.1.10.1", "10.1.10.1", "changed", "https"),
+        (81, "10.1.10.1", "10.1.10.1", "created", "http"),
+        (80, "1.1.1.1", "1.1.1.1", "created", "https"),
+    ),
+    ids=("joined-http", "changed-https", "created-http", "created-https"),
 )
-@pytest.mark.parametrize("event_name", ("joined", "changed", "created"))
-@pytest.mark.parametrize("scheme", ("http", "https"))
 def test_ingress_per_app_created(
-    traefik_ctx, port, ip, host, model, traefik_container, event_name, tmp_path, scheme
+    traefik_ctx, port, ip, host, traefik_container, event_name, tmp_path, scheme
 ):
     """Check the config when a new ingress per app is created or changes (single remote unit)."""
     ipa = create_ingress_relation(port=port, scheme=scheme, hosts=[host], ips=[ip])
-    state = State(
-        model=model,
-        config={"routing_mode": "path", "external_hostname": "foo.com"},
-        containers=[traefik_container],
-        relations=[ipa],
-    )
+    state = PATH_ROUTING_STATE.replace(containers=[traefik_container], relations=[ipa])
 
     # WHEN any relevant event fires
     event = getattr(ipa, f"{event_name}_event")
@@ -47,30 +51,22 @@ def test_ingress_per_app_created(
         .joinpath(f"opt/traefik/juju/juju_ingress_ingress_{ipa.relation_id}_remote.yaml")
         .read_text()
     )
-
-    service_def = {
-        "loadBalancer": {"servers": [{"url": f"{scheme}://{host}:{port}"}]},
-    }
-
-    if scheme == "https":
-        # traefik has no tls relation, but the requirer does: reverse termination case
-        # service_def["rootCAs"] = ["/opt/traefik/juju/certificate.cert"]
-        service_def["loadBalancer"]["serversTransport"] = "reverseTerminationTransport"
-        # service_def["serversTransports"] = {
-        #     "reverseTerminationTransport": {"insecureSkipVerify": True}
-        # }
-
-    assert generated_config["http"]["services"]["juju-test-model-remote-0-service"] == service_def
+    assert generated_config == single_unit_ipa_config(host, port, scheme)
 
 
+# As for the created test: every unit count, event, scheme and address shows up at least once.
 @pytest.mark.parametrize(
-    "port, ip, host", ((80, "1.1.1.{}", "1.1.1.{}"), (81, "10.1.10.{}", "10.1.10.{}"))
+    "port, ip, host, n_units, evt_name, scheme",
+    (
+        (80, "1.1.1.{}", "1.1.1.{}", 2, "joined", "http"),
+        (81, "10.1.10.{}", "10.1.10.{}", 3, "changed", "https"),
+        (80, "1.1.1.{}", "1.1.1.{}", 10, "changed", "http"),
+        (81, "10.1.10.{}", "10.1.10.{}", 10, "joined", "https"),
+    ),
+    ids=("2-joined-http", "3-changed-https", "10-changed-http", "10-joined-https"),
 )
-@pytest.mark.parametrize("n_units", (2, 3, 10))
-@pytest.mark.parametrize("evt_name", ("joined", "changed"))
-@pytest.mark.parametrize("scheme", ("http", "https"))
 def test_ingress_per_app_scale(
-    traefik_ctx, host, ip, port, model, traefik_container, tmp_path, n_units, scheme, evt_name
+    traefik_ctx, host, ip, port, traefik_container, tmp_path, n_units, scheme, evt_name
 ):
     """Check the config when a new ingress per app unit joins."""
     relation_id = 42
@@ -78,33 +74,10 @@ def test_ingress_per_app_scale(
     cfg_file = tmp_path.joinpath(
         "traefik", "juju", f"juju_ingress_ingress_{relation_id}_remote.yaml"
     )
+    # Seed the config a single remote unit would have generated (as in the created test), so
+    # that this checks the charm rewrites the existing file when the app scales.
     cfg_file.parent.mkdir(parents=True)
-
-    # config that would have been generated from mock_data_0
-    # same as config output of the previous test
-    initial_cfg = {
-        "http": {
-            "routers": {
-                f"juju-test-model-remote-{unit_id}-router": {
-                    "entryPoints": ["web"],
-                    "rule": f"PathPrefix(`/test-model-remote-{unit_id}`)",
-                    "service": f"juju-test-model-remote-{unit_id}-service",
-                },
-                f"juju-test-model-remote-{unit_id}-router-tls": {
-                    "entryPoints": ["websecure"],
-                    "rule": f"PathPrefix(`/test-model-remote-{unit_id}`)",
-                    "service": f"juju-test-model-remote-{unit_id}-service",
-                    "tls": {"domains": [{"main": "foo.com", "sans": ["*.foo.com"]}]},
-                },
-            },
-            "services": {
-                f"juju-test-model-remote-{unit_id}-service": {
-                    "loadBalancer": {"servers": [{"url": f"{scheme}://{host.format(0)}:{port}"}]}
-                }
-            },
-        }
-    }
-    cfg_file.write_text(yaml.safe_dump(initial_cfg))
+    cfg_file.write_text(yaml.safe_dump(single_unit_ipa_config(host.format(0), port, scheme)))
 
     ipa = create_ingress_relation(
         port=port,
@@ -114,34 +87,29 @@ def test_ingress_per_app_scale(
         hosts=[host.format(n) for n in range(n_units)],
         ips=[ip.format(n) for n in range(n_units)],
     )
-    state = State(
-        model=model,
-        config={"routing_mode": "path", "external_hostname": "foo.com"},
-        containers=[traefik_container],
-        relations=[ipa],
-    )
+    state = PATH_ROUTING_STATE.replace(containers=[traefik_container], relations=[ipa])
 
     traefik_ctx.run(getattr(ipa, evt_name + "_event"), state)
 
     new_config = yaml.safe_load(cfg_file.read_text())
-    # verify that the config has changed!
+    # verify that the config lists all the units
     new_lbs = new_config["http"]["services"][f"juju-test-model-remote-{unit_id}-service"][
         "loadBalancer"
     ]["servers"]
 
     assert len(new_lbs) == n_units
-    for n in range(n_units):
-        assert {"url": f"{scheme}://{host.format(n)}:{port}"} in new_lbs
+    expected_urls = {f"{scheme}://{host.format(n)}:{port}" for n in range(n_units)}
+    assert {server["url"] for server in new_lbs} == expected_urls
 
-        # expected config:
+    # expected config:
 
-        # IPA:
-        # len(d["service"][svc_name]["loadBalancer"]["servers"]) == num_units
-        # [x["url"] for x in d["service"][svc_name]["loadBalancer"]["servers"]] == all_units_urls
+    # IPA:
+    # len(d["service"][svc_name]["loadBalancer"]["servers"]) == num_units
+    # [x["url"] for x in d["service"][svc_name]["loadBalancer"]["servers"]] == all_units_urls
 
-        # IPL:
-        # len(d["service"][svc_name]["loadBalancer"]["servers"]) == 1
-        # d["service"][svc_name]["loadBalancer"]["servers"][0]["url"] == leader_url
+    # IPL:
+    # len(d["service"][svc_name]["loadBalancer"]["servers"]) == 1
+    # d["service"][svc_name]["loadBalancer"]["servers"][0]["url"] == leader_url
 
 
 @pytest.mark.parametrize(
@@ -188,24 +156,20 @@ def test_ingress_per_app_requirer_with_auto_data(host, ip, port, model, evt_name
         }
 
 
-def test_ingress_per_app_cleanup_on_remove(model, traefik_ctx, traefik_container):
+def test_ingress_per_app_cleanup_on_remove(traefik_ctx, traefik_container, tmp_path):
     """Check that config file is removed when a relation is."""
     ipa = create_ingress_relation()
 
-    td = tempfile.TemporaryDirectory()
     filename = f"juju_ingress_ingress_{ipa.relation_id}_remote.yaml"
-    conf_file = Path(td.name).joinpath(filename)
+    conf_file = tmp_path.joinpath(filename)
     conf_file.write_text("foobar")
 
-    traefik_container = traefik_container.replace(mounts={"conf": Mount("/opt/traefik/", td.name)})
-
-    state = State(
-        model=model,
-        config={"routing_mode": "path", "external_hostname": "foo.com"},
-        containers=[traefik_container],
-        relations=[ipa],
+    traefik_container = traefik_container.replace(
+        mounts={"conf": Mount("/opt/traefik/", tmp_path)}
     )
 
+    state = PATH_ROUTING_STATE.replace(containers=[traefik_container], relations=[ipa])
+
     # WHEN the relation goes
     traefik_ctx.run(ipa.broken_event, state)
 
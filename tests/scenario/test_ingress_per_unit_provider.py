@@ -4,7 +4,7 @@
 import pytest
 from charms.traefik_k8s.v1.ingress_per_unit import IngressPerUnitProvider
 from ops.charm import CharmBase
-from scenario import Context, Model, Relation, State
+from scenario import Context, State
 from scenario.sequences import check_builtin_sequences
 
 
@@ -29,21 +29,6 @@ def test_builtin_sequences():
     )
 
 
-@pytest.fixture
-def model():
-    return Model(name="test-model")
-
-
-@pytest.fixture
-def ipu_empty():
-    return Relation(
-        endpoint="ingress-per-unit",
-        interface="ingress_per_unit",
-        remote_app_name="remote",
-        relation_id=0,
-    )
-
-
 @pytest.mark.parametrize("leader", (True, False))
 @pytest.mark.parametrize(
     "event_name",
@@ -1,4 +1,3 @@
-import tempfile
 from unittest.mock import MagicMock, PropertyMock, patch
 
 import ops.pebble
@@ -29,14 +28,13 @@ def _create_tls_relation(*, app_name: str, strip_prefix: bool, redirect_https: b
 @patch("charm.TraefikIngressCharm._static_config_changed", MagicMock(return_value=False))
 @patch("charm.TraefikIngressCharm.version", PropertyMock(return_value="0.0.0"))
 def test_middleware_config(
-    traefik_ctx, routing_mode, strip_prefix, redirect_https, tls_from_configs
+    traefik_ctx, routing_mode, strip_prefix, redirect_https, tls_from_configs, tmp_path
 ):
-    td = tempfile.TemporaryDirectory()
     containers = [
         Container(
             name="traefik",
             can_connect=True,
-            mounts={"configurations": Mount("/opt/traefik/", td.name)},
+            mounts={"configurations": Mount("/opt/traefik/", tmp_path)},
             exec_mock={("find", "/opt/traefik/juju", "-name", "*.yaml", "-delete"): ExecOutput()},
             layers={
                 "traefik": ops.pebble.Layer({"services": {"traefik": {"startup": "enabled"}}})
@@ -7,48 +7,19 @@ from unittest.mock import PropertyMock, patch
 
 import pytest
 import yaml
-from ops import pebble
-from scenario import Container, Model, Mount, Relation, State
+from scenario import Relation
 
-
-@pytest.fixture
-def model():
-    return Model(name="test-model")
-
-
-@pytest.fixture
-def traefik_container(tmp_path):
-    layer = pebble.Layer(
-        {
-            "summary": "Traefik layer",
-            "description": "Pebble config layer for Traefik",
-            "services": {
-                "traefik": {
-                    "override": "replace",
-                    "summary": "Traefik",
-                    "command": '/bin/sh -c "/usr/bin/traefik | tee /var/log/traefik.log"',
-                    "startup": "enabled",
-                },
-            },
-        }
-    )
-
-    opt = Mount("/opt/", tmp_path)
-
-    return Container(
-        name="traefik",
-        can_connect=True,
-        layers={"traefik": layer},
-        service_status={"traefik": pebble.ServiceStatus.ACTIVE},
-        mounts={"opt": opt},
-    )
+from tests.scenario.conftest import PATH_ROUTING_STATE, single_unit_ipa_config
 
 
 @patch("charm.TraefikIngressCharm._static_config_changed", PropertyMock(return_value=False))
-@pytest.mark.parametrize("port, host", ((80, "1.1.1.1"), (81, "10.1.10.1")))
-@pytest.mark.parametrize("event_name", ("joined", "changed", "created"))
+@pytest.mark.parametrize(
+    "port, host, event_name",
+    ((80, "1.1.1.1", "joined"), (81, "10.1.10.1", "changed"), (80, "1.1.1.1", "created")),
+    ids=("joined", "changed", "created"),
+)
 def test_ingress_per_app_created(
-    traefik_ctx, port, host, model, traefik_container, event_name, tmp_path, caplog
+    traefik_ctx, port, host, traefik_container, event_name, tmp_path, caplog
 ):
     """Check the config when a new ingress per leader is created or changes (single remote unit)."""
     ipa = Relation(
@@ -61,12 +32,7 @@ def test_ingress_per_app_created(
         },
         relation_id=1,
     )
-    state = State(
-        model=model,
-        config={"routing_mode": "path", "external_hostname": "foo.com"},
-        containers=[traefik_container],
-        relations=[ipa],
-    )
+    state = PATH_ROUTING_STATE.replace(containers=[traefik_container], relations=[ipa])
 
     # WHEN any relevant event fires
     event = getattr(ipa, f"{event_name}_event")
@@ -80,47 +46,17 @@ def test_ingress_per_app_created(
         .joinpath(f"opt/traefik/juju/juju_ingress_ingress_{ipa.relation_id}_remote.yaml")
         .read_text()
     )
-
-    assert generated_config["http"]["services"]["juju-test-model-remote-0-service"] == {
-        "loadBalancer": {"servers": [{"url": f"http://{host}:{port}"}]},
-    }
+    assert generated_config == single_unit_ipa_config(host, port)
 
 
 @patch("charm.TraefikIngressCharm._static_config_changed", PropertyMock(return_value=False))
 @pytest.mark.parametrize("port, host", ((80, "1.1.1.2"), (81, "10.1.10.2")))
-@pytest.mark.parametrize("n_units", (2, 3, 10))
-def test_ingress_per_app_scale(
-    traefik_ctx, host, port, model, traefik_container, tmp_path, n_units, caplog
-):
+def test_ingress_per_app_scale(traefik_ctx, host, port, traefik_container, tmp_path, caplog):
     """Check the config when a new ingress per leader unit joins."""
     cfg_file = tmp_path.joinpath("traefik", "juju", "juju_ingress_ingress_1_remote.yaml")
+    # Seed the config the created test generates, so that this checks the charm rewrites it.
     cfg_file.parent.mkdir(parents=True)
-
-    # config that would have been generated from mock_data_0
-    # same as config output of the previous test
-    initial_cfg = {
-        "http": {
-            "routers": {
-                "juju-test-model-remote-0-router": {
-                    "entryPoints": ["web"],
-                    "rule": "PathPrefix(`/test-model-remote-0`)",
-                    "service": "juju-test-model-remote-0-service",
-                },
-                "juju-test-model-remote-0-router-tls": {
-                    "entryPoints": ["websecure"],
-                    "rule": "PathPrefix(`/test-model-remote-0`)",
-                    "service": "juju-test-model-remote-0-service",
-                    "tls": {"domains": [{"main": "foo.com", "sans": ["*.foo.com"]}]},
-                },
-            },
-            "services": {
-                "juju-test-model-remote-0-service": {
-                    "loadBalancer": {"servers": [{"url": f"http://{host}:{port}"}]}
-                }
-            },
-        }
-    }
-    cfg_file.write_text(yaml.safe_dump(initial_cfg))
+    cfg_file.write_text(yaml.safe_dump(single_unit_ipa_config(host, port)))
     ipa = Relation(
         "ingress",
         remote_app_data={
@@ -131,19 +67,14 @@ def test_ingress_per_app_scale(
         },
         relation_id=1,
     )
-    state = State(
-        model=model,
-        config={"routing_mode": "path", "external_hostname": "foo.com"},
-        containers=[traefik_container],
-        relations=[ipa],
-    )
+    state = PATH_ROUTING_STATE.replace(containers=[traefik_container], relations=[ipa])
 
     with caplog.at_level("WARNING"):
         traefik_ctx.run(ipa.changed_event, state)
     assert "is using a deprecated ingress v1 protocol to talk to Traefik." in caplog.text
 
     new_config = yaml.safe_load(cfg_file.read_text())
-    # verify that the config has changed!
+    # verify that the config lists the leader only
     new_lbs = new_config["http"]["services"]["juju-test-model-remote-service"]["loadBalancer"][
         "servers"
     ]
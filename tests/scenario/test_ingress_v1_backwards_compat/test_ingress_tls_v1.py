@@ -1,4 +1,3 @@
-import tempfile
 from unittest.mock import PropertyMock, patch
 
 import pytest
@@ -46,13 +45,14 @@ def _create_tls_relation(*, app_name: str, strip_prefix: bool, redirect_https: b
 @patch("traefik.Traefik.is_ready", PropertyMock(return_value=True))
 @patch("charm.TraefikIngressCharm._static_config_changed", PropertyMock(return_value=False))
 @patch("charm.TraefikIngressCharm.version", PropertyMock(return_value="0.0.0"))
-def test_middleware_config(traefik_ctx, routing_mode, strip_prefix, redirect_https, caplog):
-    td = tempfile.TemporaryDirectory()
+def test_middleware_config(
+    traefik_ctx, routing_mode, strip_prefix, redirect_https, caplog, tmp_path
+):
     containers = [
         Container(
             name="traefik",
             can_connect=True,
-            mounts={"configurations": Mount("/opt/traefik/", td.name)},
+            mounts={"configurations": Mount("/opt/traefik/", tmp_path)},
         )
     ]
 
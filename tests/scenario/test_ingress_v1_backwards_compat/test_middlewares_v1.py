@@ -1,7 +1,6 @@
 # Copyright 2023 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-import tempfile
 import unittest
 from unittest.mock import PropertyMock, patch
 
@@ -62,14 +61,13 @@ def _create_relation(
 @patch("charm.TraefikIngressCharm._static_config_changed", PropertyMock(return_value=False))
 @patch("charm.TraefikIngressCharm.version", PropertyMock(return_value="0.0.0"))
 def test_middleware_config(
-    traefik_ctx, rel_name, routing_mode, strip_prefix, redirect_https, caplog
+    traefik_ctx, rel_name, routing_mode, strip_prefix, redirect_https, caplog, tmp_path
 ):
-    td = tempfile.TemporaryDirectory()
     containers = [
         Container(
             name="traefik",
             can_connect=True,
-            mounts={"configurations": Mount("/opt/traefik/", td.name)},
+            mounts={"configurations": Mount("/opt/traefik/", tmp_path)},
         )
     ]
 
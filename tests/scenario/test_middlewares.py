@@ -1,7 +1,6 @@
 # Copyright 2023 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-import tempfile
 from pathlib import Path
 from unittest.mock import PropertyMock, patch
 
@@ -70,14 +69,13 @@ def _create_relation(
 @patch("traefik.Traefik.is_ready", PropertyMock(return_value=True))
 @patch("charm.TraefikIngressCharm.version", PropertyMock(return_value="0.0.0"))
 def test_middleware_config(
-    traefik_ctx, rel_name, routing_mode, strip_prefix, redirect_https, scheme
+    traefik_ctx, rel_name, routing_mode, strip_prefix, redirect_https, scheme, tmp_path
 ):
-    td = tempfile.TemporaryDirectory()
     containers = [
         Container(
             name="traefik",
             can_connect=True,
-            mounts={"configurations": Mount("/opt/traefik/", td.name)},
+            mounts={"configurations": Mount("/opt/traefik/", tmp_path)},
             exec_mock={("find", "/opt/traefik/juju", "-name", "*.yaml", "-delete"): ExecOutput()},
             layers={
                 "traefik": ops.pebble.Layer({"services": {"traefik": {"startup": "enabled"}}})
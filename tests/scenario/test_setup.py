@@ -5,9 +5,8 @@
 
 from unittest.mock import PropertyMock, patch
 
-from scenario import Container, Context, State
+from scenario import Container, State
 
-from charm import TraefikIngressCharm
 from traefik import Traefik
 
 
@@ -40,7 +39,7 @@ def test_start_traefik_is_not_running(*_, traefik_ctx):
             )
         ],
     )
-    out = Context(charm_type=TraefikIngressCharm).run("start", state)
+    out = traefik_ctx.run("start", state)
     assert out.unit_status == ("waiting", f"waiting for service: '{Traefik.service_name}'")
 
 
@@ -50,7 +49,7 @@ def test_start_traefik_no_hostname(*_, traefik_ctx):
         config={"routing_mode": "path"},
         containers=[Container(name="traefik", can_connect=False)],
     )
-    out = Context(charm_type=TraefikIngressCharm).run("start", state)
+    out = traefik_ctx.run("start", state)
     assert out.unit_status == (
         "blocked",
         "Traefik load balancer is unable to obtain an IP or hostname from the cluster.",
@@ -65,5 +64,5 @@ def test_start_traefik_active(*_, traefik_ctx):
         config={"routing_mode": "path"},
         containers=[Container(name="traefik", can_connect=False)],
     )
-    out = Context(charm_type=TraefikIngressCharm).run("start", state)
+    out = traefik_ctx.run("start", state)
     assert out.unit_status == ("active", "Serving at foo.bar")
@@ -10,8 +10,9 @@ from scenario import Relation, State
 from traefik import STATIC_CONFIG_PATH
 
 
-@pytest.fixture
-def charm_tracing_relation():
+# The provider databags are constant: serialize them (through pydantic) once per module.
+@pytest.fixture(scope="module")
+def charm_tracing_databag():
     db = {}
     TracingProviderAppData(
         receivers=[
@@ -21,12 +22,11 @@ def charm_tracing_relation():
             )
         ]
     ).dump(db)
-    tracing = Relation("charm-tracing", remote_app_data=db)
-    return tracing
+    return db
 
 
-@pytest.fixture
-def workload_tracing_relation():
+@pytest.fixture(scope="module")
+def workload_tracing_databag():
     workload_db = {}
     TracingProviderAppData(
         receivers=[
@@ -36,8 +36,17 @@ def workload_tracing_relation():
             )
         ]
     ).dump(workload_db)
-    workload_tracing = Relation("workload-tracing", remote_app_data=workload_db)
-    return workload_tracing
+    return workload_db
+
+
+@pytest.fixture
+def charm_tracing_relation(charm_tracing_databag):
+    return Relation("charm-tracing", remote_app_data=charm_tracing_databag)
+
+
+@pytest.fixture
+def workload_tracing_relation(workload_tracing_databag):
+    return Relation("workload-tracing", remote_app_data=workload_tracing_databag)
 
 
 def test_charm_trace_collection(traefik_ctx, traefik_container, caplog, charm_tracing_relation):
@@ -15,12 +15,13 @@ from ops.charm import CharmBase
 from ops.testing import Harness
 
 
-@pytest.fixture(params=("only-this-unit", "all-units", "both"))
+@pytest.fixture(scope="module", params=("only-this-unit", "all-units", "both"))
 def listen_to(request):
     return request.param
 
 
-@pytest.fixture
+# Harness subclasses the charm type it's given, so one class per listen_to value is enough.
+@pytest.fixture(scope="module")
 def charm_cls(listen_to):
     class MyCharm(CharmBase):
         def __init__(self, framework):